@@ -1,14 +1,26 @@
 import sys
-import os
 import json
-import datetime
-# Force local library usage
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import aerosandbox as asb
 import aerosandbox.numpy as np
+import numpy as onp
 import matplotlib.pyplot as plt
-from physics_model import DronePhysics, PhysicsConstants
+from physics_model import DronePhysics, PhysicsConstants, get_time_grid
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; fall back to the vectorized NumPy integrator
+    njit = None
+    prange = range
+
+# Daily sampling, shared by every day of the year
+N = 50
+TIME = get_time_grid(N)
+DT = 86400 / (N - 1)
+DAYS = np.arange(1, 366)
+
+# First day of each month (non-leap year), for date labels and x-axis ticks
+MONTH_STARTS = onp.array([1, 32, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335])
+MONTH_NAMES = ('Jan','Feb','Mar','Apr','May','Jun','Jul','Aug','Sep','Oct','Nov','Dec')
 
 def load_design():
     """Type-safe loading of design specs."""
@@ -19,9 +31,74 @@ def load_design():
         print("Error: 'design_specs.json' not found. Please run 'optimize.py' first.")
         sys.exit(1)
 
-def check_feasibility_on_day(day_of_year, design, latitude=20.0):
+def _day_label(day_of_year):
+    """Formats a day of the year as e.g. 'Jun 21'."""
+    month = onp.searchsorted(MONTH_STARTS, day_of_year, side="right") - 1
+    return f"{MONTH_NAMES[month]} {int(day_of_year - MONTH_STARTS[month]) + 1:02d}"
+
+def _integrate_battery_numpy(power_in, total_power_out, dt, max_energy_J, current_energy):
     """
-    Checks if perpetual flight is possible on a specific day using the optimized design.
+    Returns the lowest battery energy reached over the day (forward Euler, capped at max).
+    Integrates along the last axis, so a (days, N) array gives one result per day.
+    """
+    # Closed form of the forward-Euler loop: the uncapped trajectory is a running
+    # sum, and each time the battery tops out the surplus is thrown away. The
+    # running maximum of that surplus is exactly what the cap has removed so far.
+    net = power_in - total_power_out
+    trajectory = current_energy + onp.cumsum(net, axis=-1) * dt
+    spilled = onp.maximum.accumulate(onp.maximum(trajectory - max_energy_J, 0.0), axis=-1)
+    return onp.minimum(max_energy_J, onp.min(trajectory - spilled, axis=-1))
+
+def _integrate_battery_loop(power_in, total_power_out, dt, max_energy_J, current_energy):
+    """
+    Scalar version of the same integration, written for Numba to compile.
+    """
+    min_energy_seen = max_energy_J
+    for i in range(power_in.shape[0]):
+        current_energy += (power_in[i] - total_power_out) * dt
+
+        # Cap at max
+        if current_energy > max_energy_J:
+            current_energy = max_energy_J
+
+        # Track minimum
+        if current_energy < min_energy_seen:
+            min_energy_seen = current_energy
+
+    return min_energy_seen
+
+def _annual_min_energy_loop(power_in_by_day, total_power_out, dt, max_energy_J, current_energy):
+    """
+    Runs the daily integration for every row of a (days, N) array, one day per thread.
+    """
+    min_energy = onp.empty(power_in_by_day.shape[0])
+    for day in prange(power_in_by_day.shape[0]):
+        min_energy[day] = _integrate_battery(
+            power_in_by_day[day], total_power_out, dt, max_energy_J, current_energy
+        )
+    return min_energy
+
+if njit is not None:
+    _integrate_battery = njit(cache=True, fastmath=True)(_integrate_battery_loop)
+    _annual_min_energy = njit(cache=True, fastmath=True, parallel=True)(_annual_min_energy_loop)
+else:
+    _integrate_battery = _integrate_battery_numpy
+    _annual_min_energy = _integrate_battery_numpy # Already vectorized over days
+
+def solar_power_by_day(days, design, latitude=20.0):
+    """
+    Solar power input [W] for every requested day (rows) at each TIME sample (columns).
+    Computed in one broadcast call instead of once per day.
+    """
+    wing_area = DronePhysics.geometry(design["wingspan"], design["aspect_ratio"])
+    
+    return DronePhysics.solar_power_in(
+        latitude, np.reshape(days, (-1, 1)), np.reshape(TIME, (1, -1)), wing_area
+    )
+
+def _power_budget(design):
+    """
+    Returns (total_power_out [W], max_energy_J [J]) for the optimized design.
     """
     # 1. Unpack Design
     wingspan = design["wingspan"]
@@ -48,78 +125,82 @@ def check_feasibility_on_day(day_of_year, design, latitude=20.0):
     # I'll stick to 50W to match optimize.py logic.
     total_power_out = power_draw_motor + 50.0
 
-    # 3. Solar Input for THIS Day
-    N = 50
-    time = np.linspace(0, 86400, N)
+    # 3. Battery Capacity
+    max_energy_J = battery_mass * battery_capacity * 3600
     
-    power_in = DronePhysics.solar_power_in(
-        latitude, day_of_year, time, wing_area
-    )
+    return total_power_out, max_energy_J
+
+def check_feasibility_on_day(power_in, design):
+    """
+    Checks if perpetual flight is possible on a specific day using the optimized design.
+    `power_in` is that day's solar power input [W] at each TIME sample
+    (one row of `solar_power_by_day`).
+    """
+    total_power_out, max_energy_J = _power_budget(design)
     
     # 4. Battery Simulation
-    max_energy_J = battery_mass * battery_capacity * 3600
     current_energy = max_energy_J / 2 # Start at 50%
-    min_energy_seen = max_energy_J 
-    
-    dt = 86400 / (N - 1)
-    
     # Integration
-    for i in range(N):
-        net = power_in[i] - total_power_out
-        current_energy += net * dt
-        
-        # Cap at max
-        if current_energy > max_energy_J:
-            current_energy = max_energy_J
-            
-        # Track minimum
-        if current_energy < min_energy_seen:
-            min_energy_seen = current_energy
+    min_energy_seen = _integrate_battery(
+        power_in, total_power_out, DT, max_energy_J, current_energy
+    )
             
     return min_energy_seen
 
+def check_feasibility_by_day(power_in_by_day, design):
+    """
+    Same check as `check_feasibility_on_day`, for a whole (days, N) block of solar input
+    at once. Returns the minimum stored energy [J] reached on each day.
+
+    Stays in float64 on purpose: an optimized design sits right on the feasibility
+    boundary on its design day (margin ~0 J), and float32 rounding of the multi-MJ
+    running sum (~1 J) is enough to flip the sign of that margin.
+    """
+    total_power_out, max_energy_J = _power_budget(design)
+    
+    power_in_by_day = onp.ascontiguousarray(power_in_by_day, dtype=onp.float64)
+    current_energy = max_energy_J / 2 # Start at 50%
+    
+    return _annual_min_energy(
+        power_in_by_day, total_power_out, DT, max_energy_J, current_energy
+    )
+
 if __name__ == "__main__":
     print("Running Year-Round Survival Analysis...")
     design = load_design()
     print(f"Loaded Design: {design['wingspan']:.2f}m Span, {design['total_weight']:.1f}kg Mass")
     print("-" * 50)
     
-    days = np.arange(1, 366)
-    margins = []
+    days = DAYS
     latitude = 20.0 
     
     print(f"Simulating operation at {latitude} degrees Latitude...")
     
-    for day in days:
-        margin_J = check_feasibility_on_day(day, design, latitude)
-        margin_kWh = margin_J / 3.6e6
-        margins.append(margin_kWh)
+    # Solar input for the whole year, computed once, then integrated in a single pass
+    power_in_by_day = solar_power_by_day(days, design, latitude)
+    margins = check_feasibility_by_day(power_in_by_day, design) / 3.6e6 # kWh
         
     # Plotting
-    margins = np.array(margins)
     
-    operational_days = days[margins > 0]
-    if len(operational_days) > 0:
-        start_day = operational_days[0]
-        end_day = operational_days[-1]
+    survives = margins > 0
+    operational_idx = onp.flatnonzero(survives)
+    if operational_idx.size > 0:
+        start_day = days[operational_idx[0]]
+        end_day = days[operational_idx[-1]]
         
-        start_date = (datetime.datetime(2025, 1, 1) + datetime.timedelta(days=int(start_day)-1)).strftime("%b %d")
-        end_date = (datetime.datetime(2025, 1, 1) + datetime.timedelta(days=int(end_day)-1)).strftime("%b %d")
-        status_msg = f"Operational Window: {start_date} to {end_date}"
+        status_msg = f"Operational Window: {_day_label(start_day)} to {_day_label(end_day)}"
     else:
         status_msg = "Operational Window: NONE (Infeasible Year-Round)"
 
     plt.figure(figsize=(10, 6))
     
-    plt.fill_between(days, margins, 0, where=(margins>0), color='green', alpha=0.3, label="Survives Night")
-    plt.fill_between(days, margins, 0, where=(margins<=0), color='red', alpha=0.3, label="Crashes")
+    plt.fill_between(days, margins, 0, where=survives, color='green', alpha=0.3, label="Survives Night")
+    plt.fill_between(days, margins, 0, where=~survives, color='red', alpha=0.3, label="Crashes")
     
     plt.plot(days, margins, color='black', linewidth=1)
     plt.axhline(0, color='black', linewidth=2)
     
-    month_starts = [1, 32, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335]
-    month_names = ['Jan','Feb','Mar','Apr','May','Jun','Jul','Aug','Sep','Oct','Nov','Dec']
-    plt.xticks(month_starts, month_names)
+    plt.xticks(ticks=MONTH_STARTS, labels=MONTH_NAMES)
     
     plt.title(f"Year-Round Mission Availability (Lat: {latitude}N)\n{status_msg}")
     plt.xlabel("Date")
@@ -1,19 +1,24 @@
-import sys
-import os
-# Force local library usage
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 import aerosandbox as asb
 import aerosandbox.numpy as np
 import matplotlib.pyplot as plt
-from physics_model import DronePhysics, PhysicsConstants
+from physics_model import DronePhysics, PhysicsConstants, get_time_grid
 
-def solve_for_required_tech(latitude, payload_mass=2.0):
+# Solar & Energy sampling (identical for every latitude)
+DAY_OF_YEAR = 172 # Summer Solstice 
+N = 40
+TIME = get_time_grid(N)
+DT = 86400 / (N - 1)
+
+def build_tech_problem(payload_mass=2.0):
     """
-    Solves the Inverse Problem:
-    Given a Latitude and Payload, WHAT is the minimum Battery Energy Density (Wh/kg) required?
+    Builds the Inverse Problem once. Latitude only enters through the solar flux, which is
+    left as an Opti parameter so the same problem can be re-solved across a latitude sweep.
+
+    Returns (opti, flux_param, required_battery_density), where flux_param takes the
+    output of `DronePhysics.solar_flux_profile_per_m2` for the latitude being solved.
     """
     opti = asb.Opti()
+    flux_per_m2 = opti.parameter(value=0.0, n_params=N)
 
     # Variables
     wingspan = opti.variable(init_guess=30, lower_bound=10, upper_bound=60)
@@ -30,12 +35,12 @@ def solve_for_required_tech(latitude, payload_mass=2.0):
     
     # Mass Model
     # Note: PhysicsConstants.mass_mppt and others are used internally by DronePhysics
-    mass_data = DronePhysics.mass_breakdown(
+    total_calculated_mass = DronePhysics.mass_total_only(
         wingspan, wing_area, total_weight, battery_mass, payload_mass
     )
     
     opti.subject_to([
-        total_weight / 9.81 >= mass_data["total_calculated"]
+        total_weight / 9.81 >= total_calculated_mass
     ])
 
     # Aerodynamics
@@ -54,13 +59,7 @@ def solve_for_required_tech(latitude, payload_mass=2.0):
     total_power_out = power_draw_motor + power_draw_avionics
 
     # Solar & Energy
-    day_of_year = 172 # Summer Solstice 
-    N = 40
-    time = np.linspace(0, 86400, N)
-    
-    power_in = DronePhysics.solar_power_in(
-        latitude, day_of_year, time, wing_area
-    )
+    power_in = flux_per_m2 * wing_area
     
     # Energy Balance
     # Total Energy Stored = Mass * Density
@@ -69,11 +68,9 @@ def solve_for_required_tech(latitude, payload_mass=2.0):
     # Initial guess
     energy = opti.variable(init_guess=1e7, n_vars=N)
     
-    dt = 86400 / (N - 1)
-    
-    for i in range(N-1):
-        net_power = power_in[i] - total_power_out
-        opti.subject_to(energy[i+1] == energy[i] + net_power * dt)
+    # Euler dynamics for every step at once, as a single vector constraint
+    net_power = power_in[:-1] - total_power_out
+    opti.subject_to(energy[1:] == energy[:-1] + net_power * DT)
         
     opti.subject_to([
         energy >= 0,
@@ -84,11 +81,50 @@ def solve_for_required_tech(latitude, payload_mass=2.0):
     # OBJECTIVE: Minimize the Required Tech Level
     opti.minimize(required_battery_density)
     
-    try:
-        sol = opti.solve(verbose=False)
-        return sol.value(required_battery_density)
-    except:
-        return None
+    return opti, flux_per_m2, required_battery_density
+
+def flux_profiles_by_latitude(latitudes):
+    """
+    Solar power per unit wing area (W/m^2) for every latitude (rows) at each TIME sample
+    (columns), computed in one broadcast call.
+    """
+    return DronePhysics.solar_flux_profile_per_m2(
+        np.reshape(latitudes, (-1, 1)), DAY_OF_YEAR, np.reshape(TIME, (1, -1))
+    )
+
+def solve_latitude_sweep(latitudes, payload_mass=2.0, flux_profiles=None):
+    """
+    Solves the Inverse Problem for each latitude in turn, reusing one Opti problem.
+    Each successful solve warm-starts the next latitude.
+
+    `flux_profiles` may carry the matching rows of `flux_profiles_by_latitude`, if
+    the caller has already computed them.
+    """
+    if flux_profiles is None:
+        flux_profiles = flux_profiles_by_latitude(latitudes)
+        
+    opti, flux_param, required_battery_density = build_tech_problem(payload_mass)
+    
+    required_tech = []
+    for flux_profile in flux_profiles:
+        opti.set_value(flux_param, flux_profile)
+        try:
+            sol = opti.solve(verbose=False)
+        except RuntimeError: # IPOPT failed to converge: infeasible at this latitude
+            required_tech.append(None)
+            continue
+        
+        opti.set_initial_from_sol(sol)
+        required_tech.append(sol.value(required_battery_density))
+        
+    return required_tech
+
+def solve_for_required_tech(latitude, payload_mass=2.0):
+    """
+    Solves the Inverse Problem:
+    Given a Latitude and Payload, WHAT is the minimum Battery Energy Density (Wh/kg) required?
+    """
+    return solve_latitude_sweep([latitude], payload_mass)[0]
 
 if __name__ == "__main__":
     print("Running Enterprise Technology Boundary Analysis (Unified Physics)...")
@@ -96,14 +132,16 @@ if __name__ == "__main__":
     print("-" * 40)
     
     latitudes = [0, 10, 20, 30, 40, 50, 60]
-    required_tech = []
+    
+    # Serial on purpose: the warm-started sweep takes ~0.1 s, while each extra worker
+    # process would pay ~0.7 s just to re-import aerosandbox.
+    flux_profiles = flux_profiles_by_latitude(latitudes)
+    required_tech = solve_latitude_sweep(latitudes, 2.0, flux_profiles)
     
     print(f"{'Lat (deg)':<10} | {'Req. Battery (Wh/kg)':<25} | {'Feasibility'}")
     print("-" * 50)
     
-    for lat in latitudes:
-        tech = solve_for_required_tech(lat, payload_mass=2.0)
-        
+    for lat, tech in zip(latitudes, required_tech):
         if tech:
             status = "FEASIBLE"
             if tech > 500: status = "FUTURE TECH (2030+)"
@@ -111,10 +149,8 @@ if __name__ == "__main__":
             else: status = "AVAILABLE NOW"
             
             print(f"{lat:<10} | {tech:<25.1f} | {status}")
-            required_tech.append(tech)
         else:
             print(f"{lat:<10} | {'Infeasible':<25} | IMPOSSIBLE")
-            required_tech.append(None)
             
     # Plotting
     valid_lats = [l for l, t in zip(latitudes, required_tech) if t is not None]
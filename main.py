@@ -1,11 +1,20 @@
+import functools
 import aerosandbox as asb
 import aerosandbox.numpy as np
 
+@functools.lru_cache(maxsize=1)
 def design_drone():
+    # The geometry is fixed, so build it once and hand back the same Airplane
+    # on every call. Treat the returned object as read-only.
+
     # 1. Define the Geometry
     # ----------------------
     # We are building a "Solar Phantom" - high aspect ratio, lightweight.
     
+    # Shared airfoils (each asb.Airfoil regenerates its coordinates on construction)
+    naca4412 = asb.Airfoil("naca4412") # High lift airfoil
+    naca0012 = asb.Airfoil("naca0012") # Symmetric, for the tail surfaces
+    
     airplane = asb.Airplane(
         name="Solar Phantom",
         xyz_ref=[0, 0, 0], # Center of gravity (roughly)
@@ -22,21 +31,21 @@ def design_drone():
                         y_le=0,
                         chord=1.2,
                         twist=0,
-                        airfoil=asb.Airfoil("naca4412") # High lift airfoil
+                        airfoil=naca4412
                     ),
                     asb.WingSection(
                         name="Mid",
                         y_le=2.5,
                         chord=1.0,
                         twist=0,
-                        airfoil=asb.Airfoil("naca4412")
+                        airfoil=naca4412
                     ),
                     asb.WingSection(
                         name="Tip",
                         y_le=6.0, # 12 meter wingspan!
                         chord=0.6,
                         twist=-2, # Washout to prevent tip stall
-                        airfoil=asb.Airfoil("naca4412")
+                        airfoil=naca4412
                     ),
                 ]
             ),
@@ -51,13 +60,13 @@ def design_drone():
                         name="Root",
                         y_le=0,
                         chord=0.6,
-                        airfoil=asb.Airfoil("naca0012")
+                        airfoil=naca0012
                     ),
                     asb.WingSection(
                         name="Tip",
                         y_le=1.5,
                         chord=0.4,
-                        airfoil=asb.Airfoil("naca0012")
+                        airfoil=naca0012
                     )
                 ]
             ),
@@ -72,14 +81,14 @@ def design_drone():
                         name="Root",
                         y_le=0,
                         chord=0.7,
-                        airfoil=asb.Airfoil("naca0012")
+                        airfoil=naca0012
                     ),
                     asb.WingSection(
                         name="Tip",
                         y_le=0, # Vertical
                         z_le=1.0, # Height
                         chord=0.4,
-                        airfoil=asb.Airfoil("naca0012")
+                        airfoil=naca0012
                     )
                 ]
             )
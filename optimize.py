@@ -3,135 +3,476 @@ import os
 import json
 import argparse
 import datetime
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import functools
+import itertools
+import types
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import aerosandbox as asb
-import aerosandbox.numpy as np
-from physics_model import DronePhysics, PhysicsConstants
+import numpy as onp
+from physics_model import DronePhysics, PhysicsConstants, get_time_grid
 
-def optimize_drone(payload_mass=5.0, target_lat=20, min_battery_density=350):
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library json
+    orjson = None
+
+# Solar Energy sampling
+DAY_OF_YEAR = 172 # Summer Solstice
+# Forward Euler on 50 samples keeps the optimum within ~0.05% of a 1000-sample solve.
+# Trapezoidal steps do no better here: the flux has kinks at sunrise/sunset and the
+# battery limits only hold at the samples, so at N=20 the optimum moves by up to ~1%.
+N = 50
+
+# PhysicsConstants that enter the NLP graph, made Opti parameters by `as_parameters=True`.
+# The solar efficiency chain is not listed: it only scales the numeric solar profile.
+PHYSICS_PARAMETERS = (
+    "g", "CD0", "oswald_eff", "propulsive_eff",
+    "struct_mass_coeff", "struct_mass_exp", "mass_mppt", "mass_avionics", "mass_solar_density",
+)
+
+# CasADi JIT: compile the NLP functions to native code instead of running them
+# in CasADi's virtual machine. Tuned for the machine running the solve.
+JIT_OPTIONS = {
+    "compiler": "shell",
+    "jit_options": {"flags": ["-O3", "-march=native"]},
+}
+
+@functools.lru_cache(maxsize=1)
+def _ipopt_linear_solver():
+    """
+    Returns "ma27" if the HSL linear solvers are installed, else IPOPT's bundled "mumps".
+    Probed once per process with a trivial problem.
+    """
+    probe = asb.Opti()
+    x = probe.variable(init_guess=0)
+    probe.minimize((x - 1) ** 2)
+    try:
+        probe.solve(verbose=False, options={"ipopt.linear_solver": "ma27"})
+        return "ma27"
+    except RuntimeError:
+        return "mumps"
+
+@functools.lru_cache(maxsize=1)
+def _jit_available():
+    """
+    Returns True if CasADi can JIT-compile through a C compiler on this machine.
+    Probed once per process with a trivial problem.
+    """
+    probe = asb.Opti()
+    x = probe.variable(init_guess=0)
+    probe.minimize((x - 1) ** 2)
+    try:
+        probe.solve(verbose=False, jit=True, options=JIT_OPTIONS)
+        return True
+    except RuntimeError:
+        return False
+
+def _shaped_energy_guess(power_net, max_energy):
+    """
+    Battery energy trajectory [J] implied by a net power profile [W] on the daily grid,
+    shifted so its minimum is 0 and scaled so its maximum is `max_energy`.
+    """
+    dt = 86400 / (N - 1)
+    trajectory = onp.concatenate(([0.0], onp.cumsum(power_net[:-1] * dt)))
+    trajectory -= trajectory.min()
+    if trajectory.max() <= 0: # No sunlight to shape it; start half full
+        return onp.full(N, max_energy / 2)
+    return trajectory * (max_energy / trajectory.max())
+
+@functools.lru_cache(maxsize=128)
+def _cheap_initial_guess(payload_mass, target_lat, min_battery_density):
+    """
+    Closed-form sizing used to warm-start the NLP.
+
+    Sweeps a coarse wingspan x aspect-ratio grid, flies each candidate at its
+    minimum-power speed (induced drag = 3x parasitic drag), sizes the battery to carry the
+    night, and keeps the lightest candidate that closes the 24-hour energy balance.
+    Returns a dict of initial guesses, including an energy_stored trajectory.
+    """
+    wingspan, aspect_ratio = (
+        grid.ravel() for grid in onp.meshgrid(onp.linspace(10, 80, 71), onp.linspace(10, 40, 7))
+    )
+    wing_area = DronePhysics.geometry(wingspan, aspect_ratio)
+    
+    dt = 86400 / (N - 1)
+    solar_per_m2 = DronePhysics.solar_flux_profile_on_grid(target_lat, DAY_OF_YEAR, N)
+    power_in_solar = onp.outer(wing_area, solar_per_m2)
+    
+    CL = onp.sqrt(3 * PhysicsConstants.CD0 * onp.pi * PhysicsConstants.oswald_eff * aspect_ratio)
+    
+    # Mass and battery size depend on each other; a few fixed-point passes settle them
+    total_weight = onp.full_like(wingspan, 100.0)
+    battery_mass = onp.full_like(wingspan, 30.0)
+    for _ in range(20):
+        total_weight = DronePhysics.mass_total_only(
+            wingspan, wing_area, total_weight, battery_mass, payload_mass
+        )
+        
+        lift_force = total_weight * PhysicsConstants.g
+        velocity = onp.clip(onp.sqrt(2 * lift_force / (1.225 * wing_area * CL)), 10, 50)
+        aero_data = DronePhysics.aerodynamics(
+            total_weight, velocity, wing_area, aspect_ratio
+        )
+        total_power_out = aero_data["power_required"] / PhysicsConstants.propulsive_eff + 50
+        
+        power_net = power_in_solar - total_power_out[:, None]
+        energy = onp.zeros_like(power_net)
+        energy[:, 1:] = onp.cumsum(power_net[:, :-1] * dt, axis=1)
+        battery_mass = onp.clip(
+            (energy.max(axis=1) - energy.min(axis=1)) / (min_battery_density * 3600), 5, 300
+        )
+        
+    feasible = (energy[:, -1] >= 0) & (total_weight <= 600)
+    if not feasible.any():
+        # No candidate closes the energy balance; fall back to generic guesses
+        generic_area = DronePhysics.geometry(35, 20)
+        generic_power_out = DronePhysics.aerodynamics(
+            100, 20, generic_area, 20
+        )["power_required"] / PhysicsConstants.propulsive_eff + 50
+        return {
+            "wingspan": 35, "aspect_ratio": 20, "total_weight": 100,
+            "battery_mass": 30, "velocity": 20,
+            "energy_stored": _shaped_energy_guess(
+                solar_per_m2 * generic_area - generic_power_out, 30 * min_battery_density * 3600
+            ),
+        }
+        
+    i = onp.flatnonzero(feasible)[onp.argmin(total_weight[feasible])]
+    return {
+        "wingspan": wingspan[i],
+        "aspect_ratio": aspect_ratio[i],
+        "total_weight": total_weight[i],
+        "battery_mass": battery_mass[i],
+        "velocity": velocity[i],
+        "energy_stored": _shaped_energy_guess(
+            power_net[i], battery_mass[i] * min_battery_density * 3600
+        ),
+    }
+
+@functools.lru_cache(maxsize=2)
+def build_opti(as_parameters=False):
+    """
+    Builds the perpetual-flight NLP once per process. The mission inputs are Opti
+    parameters, so sweep points re-solve this problem instead of rebuilding the graph.
+
+    Returns (opti, variables, params): dicts of the decision variables (plus derived
+    expressions needed for results) and of the parameters. Latitude enters only through
+    the solar flux, so its parameter is the per-m^2 solar profile on the daily grid.
+
+    PhysicsConstants are baked into the graph when it is built. With `as_parameters=True`
+    the PHYSICS_PARAMETERS become Opti parameters too, so changed constants take effect
+    on the next solve without a rebuild.
+    """
     # 1. Initialize the Optimization Problem
     opti = asb.Opti()
+    params = {
+        "payload_mass": opti.parameter(value=5.0),
+        "min_battery_density": opti.parameter(value=350.0),
+        "solar_per_m2": opti.parameter(value=0.0, n_params=N),
+    }
+    if as_parameters:
+        for name in PHYSICS_PARAMETERS:
+            params[name] = opti.parameter(value=getattr(PhysicsConstants, name))
+        constants = types.SimpleNamespace(**{name: params[name] for name in PHYSICS_PARAMETERS})
+    else:
+        constants = PhysicsConstants
 
     # 2. Define Variables
-    wingspan = opti.variable(init_guess=35, lower_bound=10, upper_bound=80) 
-    aspect_ratio = opti.variable(init_guess=20, lower_bound=10, upper_bound=40)
-    total_weight = opti.variable(init_guess=100, lower_bound=10, upper_bound=600)
-    battery_mass = opti.variable(init_guess=30, lower_bound=5, upper_bound=300)
-    velocity = opti.variable(init_guess=20, lower_bound=10, upper_bound=50)
+    # Initial guesses (and variable scaling) from a cheap sizing of the default mission
+    guess = _cheap_initial_guess(5.0, 20, 350)
+    wingspan = opti.variable(init_guess=guess["wingspan"], lower_bound=10, upper_bound=80) 
+    aspect_ratio = opti.variable(init_guess=guess["aspect_ratio"], lower_bound=10, upper_bound=40)
+    total_weight = opti.variable(init_guess=guess["total_weight"], lower_bound=10, upper_bound=600)
+    battery_mass = opti.variable(init_guess=guess["battery_mass"], lower_bound=5, upper_bound=300)
+    velocity = opti.variable(init_guess=guess["velocity"], lower_bound=10, upper_bound=50)
 
     # 3. Geometric Relations & Physics
     wing_area = DronePhysics.geometry(wingspan, aspect_ratio)
     
-    # Mass Breakdown
-    mass_data = DronePhysics.mass_breakdown(
-        wingspan, wing_area, total_weight, battery_mass, payload_mass
+    # Mass Model (only the total is constrained)
+    total_calculated_mass = DronePhysics.mass_total_only(
+        wingspan, wing_area, total_weight, battery_mass, params["payload_mass"], constants
     )
     
     # Enforce Mass Consistency
     opti.subject_to([
-        total_weight >= mass_data["total_calculated"]
+        total_weight >= total_calculated_mass
     ])
 
     # Aerodynamics
     aero_data = DronePhysics.aerodynamics(
-        total_weight, velocity, wing_area, aspect_ratio
+        total_weight, velocity, wing_area, aspect_ratio, constants
     )
     
     # Power Output
-    power_draw_motor = aero_data["power_required"] / PhysicsConstants.propulsive_eff
+    power_draw_motor = aero_data["power_required"] / constants.propulsive_eff
     power_draw_avionics = 50 
     total_power_out = power_draw_motor + power_draw_avionics
 
     # 4. Solar Energy Model
-    day_of_year = 172 # Summer Solstice
-    N = 50
-    time = np.linspace(0, 86400, N)
-    
-    power_in_solar = DronePhysics.solar_power_in(
-        target_lat, day_of_year, time, wing_area
-    )
+    # Numeric flux per m^2 (a parameter); the symbolic wing area is applied once, below
+    solar_per_m2 = params["solar_per_m2"]
     
     # 5. Energy Balance
-    battery_capacity_Wh_kg = min_battery_density
+    battery_capacity_Wh_kg = params["min_battery_density"]
     max_battery_energy_Joule = battery_mass * battery_capacity_Wh_kg * 3600
     
-    init_energy_guess = 50 * 350 * 3600 / 2 
-    energy_stored = opti.variable(init_guess=init_energy_guess, n_vars=N)
+    energy_stored = opti.variable(init_guess=guess["energy_stored"], lower_bound=0)
     
     dt = 86400 / (N - 1)
     
-    for i in range(N-1):
-        power_net = power_in_solar[i] - total_power_out
-        opti.subject_to([
-            energy_stored[i+1] == energy_stored[i] + power_net * dt
-        ])
+    # Euler dynamics for every step at once, as a single vector constraint
+    opti.subject_to(
+        energy_stored[1:] - energy_stored[:-1] == (solar_per_m2[:-1] * wing_area - total_power_out) * dt
+    )
         
     opti.subject_to([
-        energy_stored >= 0,
-        energy_stored <= max_battery_energy_Joule,
+        energy_stored <= max_battery_energy_Joule, # Depends on battery_mass, so not a plain bound
         energy_stored[0] == energy_stored[-1]
     ])
 
     # 6. Optimization Goal
     opti.minimize(total_weight)
 
+    variables = {
+        "wingspan": wingspan,
+        "aspect_ratio": aspect_ratio,
+        "total_weight": total_weight,
+        "battery_mass": battery_mass,
+        "velocity": velocity,
+        "energy": energy_stored,
+        "max_energy": max_battery_energy_Joule,
+        "wing_area": wing_area,
+        "power_out": total_power_out,
+    }
+    return opti, variables, params
+
+# Mission (bucketed) whose solution currently warm-starts each `build_opti` problem
+_warm_start_mission = {}
+
+def optimize_drone(payload_mass=5.0, target_lat=20, min_battery_density=350, jit=False,
+                   as_parameters=False):
+    """
+    Finds the lightest aircraft that can fly perpetually for the given mission.
+
+    Re-solves the shared problem from `build_opti`. The first solve of a new mission
+    (payload, lat and tech bucketed to 0.1 kg, 1 deg and 10 Wh/kg), or the first after a
+    failed solve, starts from the closed-form `_cheap_initial_guess`; repeat solves of the
+    same mission warm-start from the previous solution. Pass `as_parameters=True` to pick
+    up edits to PhysicsConstants between calls (sensitivity studies).
+
+    With `jit=True` the NLP is compiled to native code before solving (needs a C compiler;
+    falls back to the interpreted NLP without one). This pays off for long solves only:
+    CasADi regenerates and recompiles the NLP on every call (~0.5 s).
+    """
+    opti, variables, params = build_opti(as_parameters)
+    if as_parameters:
+        for name in PHYSICS_PARAMETERS:
+            opti.set_value(params[name], getattr(PhysicsConstants, name))
+    opti.set_value(params["payload_mass"], payload_mass)
+    opti.set_value(params["min_battery_density"], min_battery_density)
+    solar_per_m2 = DronePhysics.solar_flux_profile_on_grid(target_lat, DAY_OF_YEAR, N)
+    opti.set_value(params["solar_per_m2"], solar_per_m2)
+
+    # New mission (or last solve failed): re-seed the design from a cheap closed-form sizing
+    mission = (round(payload_mass, 1), round(target_lat), max(round(min_battery_density, -1), 10))
+    if _warm_start_mission.get(as_parameters) != mission:
+        guess = _cheap_initial_guess(*mission)
+        for name in ("wingspan", "aspect_ratio", "total_weight", "battery_mass", "velocity"):
+            opti.set_initial(variables[name], guess[name])
+
+    # Keep the design guess, but reshape its energy guess to this mission's sunlight
+    at_guess = opti.initial() + opti.value_parameters()
+    wing_area, power_out, max_energy = (
+        opti.value(variables[name], at_guess) for name in ("wing_area", "power_out", "max_energy")
+    )
+    opti.set_initial(
+        variables["energy"], _shaped_energy_guess(solar_per_m2 * wing_area - power_out, max_energy)
+    )
+
     # 7. Solve
+    solver_options = {
+        "ipopt.mu_strategy": "adaptive",
+        "ipopt.honor_original_bounds": "yes", # IPOPT relaxes bounds slightly; keep energy >= 0
+        "ipopt.linear_solver": _ipopt_linear_solver(),
+    }
+    jit = jit and _jit_available()
+    if jit:
+        solver_options.update(JIT_OPTIONS)
     try:
-        sol = opti.solve(verbose=False)
+        sol = opti.solve(
+            verbose=False, max_iter=300, jit=jit,
+            detect_simple_bounds=True, # Pass variable bounds to IPOPT as bounds, not constraints
+            options=solver_options
+        )
     except RuntimeError:
-        return None, None
+        _warm_start_mission.pop(as_parameters, None)
+        return None
+    
+    opti.set_initial_from_sol(sol)
+    _warm_start_mission[as_parameters] = mission
         
     # Pack simplified result object
     result = {
         "sol": sol,
-        "wingspan": sol.value(wingspan),
-        "total_weight": sol.value(total_weight),
-        "battery_mass": sol.value(battery_mass),
-        "velocity": sol.value(velocity),
-        "aspect_ratio": sol.value(aspect_ratio),
-        "time": time,
-        "energy": sol.value(energy_stored),
-        "max_energy": sol.value(max_battery_energy_Joule),
+        "wingspan": sol.value(variables["wingspan"]),
+        "total_weight": sol.value(variables["total_weight"]),
+        "battery_mass": sol.value(variables["battery_mass"]),
+        "velocity": sol.value(variables["velocity"]),
+        "aspect_ratio": sol.value(variables["aspect_ratio"]),
+        "time": get_time_grid(N),
+        "energy": sol.value(variables["energy"]),
+        "max_energy": sol.value(variables["max_energy"]),
         "payload": payload_mass,
         "lat": target_lat
     }
     return result
 
+def save_design_specs(design_specs, filename="design_specs.json"):
+    """Writes the design specs as indented JSON, with orjson when it is installed."""
+    if orjson is not None:
+        with open(filename, "wb") as f:
+            f.write(orjson.dumps(design_specs, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(filename, "w") as f:
+            json.dump(design_specs, f, indent=2)
+
 def generate_report(result, filename="simulation_report.md"):
-    with open(filename, "w") as f:
-        f.write("# Solar Phantom Simulation Report\n\n")
-        f.write(f"**Date**: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n")
+    # Built as one string and written in a single call
+    report = (
+        "# Solar Phantom Simulation Report\n\n"
+        f"**Date**: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n"
         
-        f.write("## 1. Mission Parameters\n")
-        f.write(f"- **Target Latitude**: {result['lat']} deg N\n")
-        f.write(f"- **Payload To Carry**: {result['payload']} kg\n\n")
+        "## 1. Mission Parameters\n"
+        f"- **Target Latitude**: {result['lat']} deg N\n"
+        f"- **Payload To Carry**: {result['payload']} kg\n\n"
         
-        f.write("## 2. Optimized Aircraft Design\n")
-        f.write(f"- **Wingspan**: {result['wingspan']:.2f} m\n")
-        f.write(f"- **Total Weight**: {result['total_weight']:.2f} kg\n")
-        f.write(f"- **Battery Mass**: {result['battery_mass']:.2f} kg\n")
-        f.write(f"- **Cruise Speed**: {result['velocity']:.2f} m/s\n\n")
+        "## 2. Optimized Aircraft Design\n"
+        f"- **Wingspan**: {result['wingspan']:.2f} m\n"
+        f"- **Total Weight**: {result['total_weight']:.2f} kg\n"
+        f"- **Battery Mass**: {result['battery_mass']:.2f} kg\n"
+        f"- **Cruise Speed**: {result['velocity']:.2f} m/s\n\n"
         
-        f.write("## 3. Feasibility\n")
-        f.write("**VERDICT**: PERPETUAL FLIGHT POSSIBLE\n")
-        f.write("The design successfully balances solar collection with power consumption for 24-hour survival.\n")
+        "## 3. Feasibility\n"
+        "**VERDICT**: PERPETUAL FLIGHT POSSIBLE\n"
+        "The design successfully balances solar collection with power consumption for 24-hour survival.\n"
+    )
+    with open(filename, "w") as f:
+        f.write(report)
     
     print(f"Report generated: {filename}")
 
+def plot_mission_profile(result):
+    """Plots the battery state over the design day. Imports matplotlib only when called."""
+    import matplotlib.pyplot as plt
+    plt.figure(figsize=(10, 6))
+    
+    E_kWh = result['energy'] / 3.6e6
+    E_max_kWh = result['max_energy'] / 3.6e6
+    t_hours = result['time'] / 3600
+    
+    plt.plot(t_hours, E_kWh, label="Battery Energy", linewidth=2, color="#f39c12")
+    plt.axhline(y=E_max_kWh, color='gray', linestyle='--', label="Max Capacity")
+    plt.axhline(y=0, color='r', linestyle='-', label="Empty")
+    
+    plt.xlabel("Time of Day (Hours)")
+    plt.ylabel("Energy Stored (kWh)")
+    plt.title(f"Perpetual Flight ({result['lat']} deg Lat): Battery State")
+    plt.grid(True, alpha=0.3)
+    plt.legend()
+    plt.fill_between(t_hours, 0, E_kWh, color="#f39c12", alpha=0.1)
+    
+    print("Plotting mission profile...")
+    plt.show()
+
+def _sweep_point(point):
+    """
+    Runs one (payload, lat, tech) point of a sweep in a worker process.
+    Returns a flat, picklable row (the CasADi solution object stays in the worker).
+    """
+    payload_mass, target_lat, min_battery_density = point
+    result = optimize_drone(payload_mass, target_lat, min_battery_density)
+    
+    row = {"payload": payload_mass, "lat": target_lat, "tech": min_battery_density}
+    row["feasible"] = result is not None
+    for key in ("wingspan", "aspect_ratio", "total_weight", "battery_mass", "velocity"):
+        row[key] = float(result[key]) if result is not None else float("nan")
+    return row
+
+def run_sweep(payloads, lats, techs, max_workers=None):
+    """
+    Solves every (payload, lat, tech) combination, one independent solve per point,
+    spread over a process pool. Returns a pandas DataFrame with one row per point.
+    """
+    import pandas as pd
+    
+    # One BLAS/OpenMP thread per worker, or IPOPT's linear algebra fights the pool for
+    # cores. Fresh (spawned) workers import aerosandbox after these are set; the caller's
+    # environment is restored once the pool has shut down.
+    thread_vars = ("OMP_NUM_THREADS", "MKL_NUM_THREADS")
+    saved_env = {name: os.environ.get(name) for name in thread_vars}
+    os.environ.update({name: "1" for name in thread_vars})
+    
+    points = list(itertools.product(payloads, lats, techs))
+    try:
+        with ProcessPoolExecutor(
+            max_workers=max_workers or os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            rows = list(pool.map(_sweep_point, points))
+    finally:
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+    
+    return pd.DataFrame(rows)
+
+def _float_list(text):
+    """argparse type for comma-separated lists of floats, e.g. "2,5,10"."""
+    return [float(value) for value in text.split(",")]
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Optimize a Solar Drone for Perpetual Flight")
-    parser.add_argument("--payload", type=float, default=5.0, help="Payload mass in kg")
-    parser.add_argument("--lat", type=float, default=20.0, help="Target latitude in degrees")
-    parser.add_argument("--tech", type=float, default=350.0, help="Battery energy density in Wh/kg")
+    parser.add_argument("--payload", type=_float_list, default=[5.0], help="Payload mass in kg (comma-separated with --sweep)")
+    parser.add_argument("--lat", type=_float_list, default=[20.0], help="Target latitude in degrees (comma-separated with --sweep)")
+    parser.add_argument("--tech", type=_float_list, default=[350.0], help="Battery energy density in Wh/kg (comma-separated with --sweep)")
+    parser.add_argument("--jit", action="store_true", help="JIT-compile the NLP with a C compiler (slow to start, faster per iteration)")
+    parser.add_argument("--report", action="store_true", help="Write a Markdown summary to 'simulation_report.md'")
+    parser.add_argument("--plot", action="store_true", help="Plot the battery state over the design day")
+    parser.add_argument("--sweep", action="store_true", help="Solve every payload/lat/tech combination in parallel and save a results table")
     
     args = parser.parse_args()
 
+    if args.sweep:
+        n_points = len(args.payload) * len(args.lat) * len(args.tech)
+        print(f"Sweeping {n_points} design points on {os.cpu_count()} cores...")
+        
+        results = run_sweep(args.payload, args.lat, args.tech)
+        print(results.to_string(index=False, float_format="{:.2f}".format))
+        
+        try:
+            results.to_parquet("sweep_results.parquet")
+            print("Sweep results saved to 'sweep_results.parquet'")
+        except ImportError: # No parquet engine (pyarrow / fastparquet) installed
+            results.to_csv("sweep_results.csv", index=False)
+            print("Sweep results saved to 'sweep_results.csv'")
+        sys.exit(0)
+
+    for name in ("payload", "lat", "tech"):
+        if len(getattr(args, name)) > 1:
+            parser.error(f"--{name} takes a list only with --sweep")
+    args.payload, args.lat, args.tech = args.payload[0], args.lat[0], args.tech[0]
+
     print(f"Optimizing for {args.payload}kg payload at {args.lat}N...")
     
     result = optimize_drone(
         payload_mass=args.payload, 
         target_lat=args.lat,
-        min_battery_density=args.tech
+        min_battery_density=args.tech,
+        jit=args.jit
     )
         
     if result is None:
@@ -156,31 +497,11 @@ if __name__ == "__main__":
         "energy_density": args.tech
     }
     
-    with open("design_specs.json", "w") as f:
-        json.dump(design_specs, f, indent=4)
-        print("Design specifications saved to 'design_specs.json'")
+    save_design_specs(design_specs)
+    print("Design specifications saved to 'design_specs.json'")
         
-    # Generate Report
-    generate_report(result)
+    if args.report:
+        generate_report(result)
 
-    # Plot
-    import matplotlib.pyplot as plt
-    plt.figure(figsize=(10, 6))
-    
-    E_kWh = result['energy'] / 3.6e6
-    E_max_kWh = result['max_energy'] / 3.6e6
-    t_hours = result['time'] / 3600
-    
-    plt.plot(t_hours, E_kWh, label="Battery Energy", linewidth=2, color="#f39c12")
-    plt.axhline(y=E_max_kWh, color='gray', linestyle='--', label="Max Capacity")
-    plt.axhline(y=0, color='r', linestyle='-', label="Empty")
-    
-    plt.xlabel("Time of Day (Hours)")
-    plt.ylabel("Energy Stored (kWh)")
-    plt.title(f"Perpetual Flight ({args.lat} deg Lat): Battery State")
-    plt.grid(True, alpha=0.3)
-    plt.legend()
-    plt.fill_between(t_hours, 0, E_kWh, color="#f39c12", alpha=0.1)
-    
-    print("Plotting mission profile...")
-    plt.show()
+    if args.plot:
+        plot_mission_profile(result)
@@ -1,6 +1,16 @@
+import functools
+import math
+from typing import NamedTuple
 import aerosandbox as asb
 import aerosandbox.numpy as np
+import numpy as onp
 from aerosandbox.library import power_solar
+from aerosandbox.atmosphere import Atmosphere
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; fall back to power_solar.solar_flux
+    njit = None
 
 class PhysicsConstants:
     """Central repository for physical constants to ensure consistency."""
@@ -26,6 +36,17 @@ class PhysicsConstants:
     mass_avionics = 1.0 # kg
     mass_solar_density = 0.35 # kg/m^2 (panel + encapsulation)
 
+class MassBreakdown(NamedTuple):
+    """Mass components [kg] of the aircraft, as returned by `DronePhysics.mass_breakdown`."""
+    structure: float
+    propulsion: float
+    solar: float
+    mppt: float
+    avionics: float
+    battery: float
+    payload: float
+    total_calculated: float
+
 class DronePhysics:
     @staticmethod
     def geometry(wingspan, aspect_ratio):
@@ -34,39 +55,58 @@ class DronePhysics:
         return wing_area
 
     @staticmethod
-    def mass_breakdown(wingspan, wing_area, total_weight, battery_mass, payload_mass):
+    def mass_breakdown(wingspan, wing_area, total_weight, battery_mass, payload_mass,
+                       constants=PhysicsConstants):
         """
-        Returns a dictionary of mass components and checks structural constraints.
+        Returns a MassBreakdown of mass components and their total.
+        `constants` may be any object with the PhysicsConstants attributes (e.g. Opti parameters).
         """
         # Structural Mass (The main scaling factor)
-        mass_structure = PhysicsConstants.struct_mass_coeff * (wingspan ** PhysicsConstants.struct_mass_exp)
+        mass_structure = constants.struct_mass_coeff * (wingspan ** constants.struct_mass_exp)
         
         mass_propulsion = 0.15 * total_weight # Motors scale with aircraft weight/power
-        mass_solar = PhysicsConstants.mass_solar_density * wing_area
+        mass_solar = constants.mass_solar_density * wing_area
         
         total_calculated_mass = (
             mass_structure + 
             mass_propulsion + 
             mass_solar + 
-            PhysicsConstants.mass_mppt + 
-            PhysicsConstants.mass_avionics + 
+            constants.mass_mppt + 
+            constants.mass_avionics + 
             battery_mass + 
             payload_mass
         )
         
-        return {
-            "structure": mass_structure,
-            "propulsion": mass_propulsion,
-            "solar": mass_solar,
-            "mppt": PhysicsConstants.mass_mppt,
-            "avionics": PhysicsConstants.mass_avionics,
-            "battery": battery_mass,
-            "payload": payload_mass,
-            "total_calculated": total_calculated_mass
-        }
+        return MassBreakdown(
+            structure=mass_structure,
+            propulsion=mass_propulsion,
+            solar=mass_solar,
+            mppt=constants.mass_mppt,
+            avionics=constants.mass_avionics,
+            battery=battery_mass,
+            payload=payload_mass,
+            total_calculated=total_calculated_mass
+        )
+
+    @staticmethod
+    def mass_total_only(wingspan, wing_area, total_weight, battery_mass, payload_mass,
+                        constants=PhysicsConstants):
+        """
+        Same total as `mass_breakdown(...).total_calculated`, without building the components.
+        Used inside the optimizers, which only constrain the total.
+        """
+        return (
+            constants.struct_mass_coeff * (wingspan ** constants.struct_mass_exp) +
+            0.15 * total_weight +
+            constants.mass_solar_density * wing_area +
+            constants.mass_mppt + 
+            constants.mass_avionics + 
+            battery_mass + 
+            payload_mass
+        )
 
     @staticmethod
-    def aerodynamics(total_weight, velocity, wing_area, aspect_ratio):
+    def aerodynamics(total_weight, velocity, wing_area, aspect_ratio, constants=PhysicsConstants):
         """
         Calculates Drag and Power Required.
         """
@@ -76,15 +116,16 @@ class DronePhysics:
                              # Input total_weight is usually kg in this project.
                              # Lift needs Newtons.
         
-        lift_force = lift * PhysicsConstants.g
+        lift_force = lift * constants.g
         
-        CL = lift_force / (q * wing_area)
+        qS = q * wing_area # Shared by lift and drag; built once in the graph
+        CL = lift_force / qS
         
         # Induced Drag
-        k = 1 / (np.pi * PhysicsConstants.oswald_eff * aspect_ratio)
-        CD = PhysicsConstants.CD0 + k * CL ** 2
+        k = 1 / (np.pi * constants.oswald_eff * aspect_ratio)
+        CD = constants.CD0 + k * CL * CL
         
-        drag_force = CD * q * wing_area
+        drag_force = CD * qS
         
         power_required_aero = drag_force * velocity
         
@@ -96,9 +137,10 @@ class DronePhysics:
         }
 
     @staticmethod
-    def solar_power_in(latitude, day_of_year, time_array, wing_area):
+    def solar_flux_profile_per_m2(latitude, day_of_year, time_array):
         """
-        Calculates solar power input over a time array.
+        Calculates electrical power per unit wing area (W/m^2) over a time array.
+        Independent of the aircraft, so it can be computed once outside the optimizer.
         """
         fluxes = power_solar.solar_flux(
             latitude=latitude,
@@ -107,9 +149,115 @@ class DronePhysics:
             panel_tilt_angle=0
         )
         
-        # Net efficiency chain
-        net_eff = (PhysicsConstants.solar_cell_eff * 
-                   PhysicsConstants.solar_cell_coverage * 
-                   PhysicsConstants.mppt_eff)
-                   
-        return fluxes * wing_area * net_eff
+        return fluxes * DronePhysics.solar_net_efficiency()
+
+    @staticmethod
+    def solar_net_efficiency():
+        """Net efficiency chain from sunlight on the wing to electrical power."""
+        return (PhysicsConstants.solar_cell_eff * 
+                PhysicsConstants.solar_cell_coverage * 
+                PhysicsConstants.mppt_eff)
+
+    @staticmethod
+    def solar_flux_profile_on_grid(latitude, day_of_year, n_samples):
+        """
+        Same profile on the standard daily grid, `get_time_grid(n_samples)`.
+        Cached across calls (latitude rounded to 1e-3 deg); the result is read-only.
+        """
+        # The efficiency is part of the key, so edits to PhysicsConstants are picked up
+        return _solar_flux_profile_on_grid(
+            round(latitude, 3), day_of_year, n_samples, DronePhysics.solar_net_efficiency()
+        )
+
+    @staticmethod
+    def solar_power_in(latitude, day_of_year, time_array, wing_area):
+        """
+        Calculates solar power input over a time array.
+        """
+        return DronePhysics.solar_flux_profile_per_m2(
+            latitude, day_of_year, time_array
+        ) * wing_area
+
+@functools.lru_cache(maxsize=None)
+def get_time_grid(n_samples):
+    """
+    Standard daily time grid [s]: n_samples points from 0 to 86400.
+    Built once per size and shared, so the array is read-only.
+    """
+    time = onp.linspace(0, 86400, n_samples)
+    time.setflags(write=False)
+    return time
+
+# Constants of power_solar.solar_flux at the settings used here (sea level, "typical" air)
+_INVERSE_TRIG_LIMIT = float(onp.nextafter(1.0, -1.0))
+_SEA_LEVEL_PRESSURE_RATIO = float(Atmosphere(altitude=0.0).pressure() / 101325.0)
+
+def _solar_flux_loop(lat_rad, doy, t_sec_array, tilt_rad):
+    """
+    Scalar port of power_solar.solar_flux (sea level, typical air, albedo 0.2, panel facing
+    north), written for Numba to compile. Angles in radians, times in seconds after solar noon.
+    """
+    flux_outside_atmosphere = 1367 * (1 + 0.034 * math.cos(2 * math.pi * doy / 365.25))
+    declination = -math.radians(23.4398) * math.cos(2 * math.pi / 365.25 * (doy + 10))
+    sin_dec, cos_dec = math.sin(declination), math.cos(declination)
+    sin_lat, cos_lat = math.sin(lat_rad), math.cos(lat_rad)
+    
+    tilt_rad = tilt_rad % (2 * math.pi)
+    if tilt_rad < math.pi:
+        fraction_facing_sky = 1 - tilt_rad / math.pi
+    else:
+        fraction_facing_sky = -1 + tilt_rad / math.pi
+    sky_view = fraction_facing_sky + 0.2 * (1 - fraction_facing_sky)
+    
+    fluxes = onp.empty(t_sec_array.shape[0])
+    for i in range(t_sec_array.shape[0]):
+        # Sun position
+        cos_hour = math.cos(2 * math.pi * t_sec_array[i] / 86400)
+        sin_elevation = sin_dec * sin_lat + cos_dec * cos_lat * cos_hour
+        sin_elevation = _INVERSE_TRIG_LIMIT * min(max(sin_elevation, -1.0), 1.0)
+        elevation = math.asin(sin_elevation)
+        
+        # Young airmass model (cosine of the zenith angle is sin(elevation))
+        c = sin_elevation
+        denominator = c * c * c + 0.149864 * c * c + 0.0102963 * c + 0.000303978
+        if denominator > 0:
+            airmass = (1.002432 * c * c + 0.148386 * c + 0.0096467) / denominator
+        else:
+            airmass = 1e100
+        transmission = 0.70 ** ((airmass * _SEA_LEVEL_PRESSURE_RATIO) ** 0.678)
+        
+        direct = flux_outside_atmosphere * transmission if elevation > 0 else 0.0
+        diffuse = flux_outside_atmosphere * (1 - transmission) * (10.0 / 28.0) * transmission * sky_view
+        
+        # Incidence on the panel; azimuth only matters once the panel is tilted
+        cos_elevation = math.cos(elevation)
+        cos_azimuth = (sin_dec * cos_lat - cos_dec * sin_lat * cos_hour) / cos_elevation
+        azimuth = math.acos(_INVERSE_TRIG_LIMIT * min(max(cos_azimuth, -1.0), 1.0))
+        if t_sec_array[i] % 86400 <= 43200:
+            azimuth = 2 * math.pi - azimuth
+        cos_incidence = (cos_elevation * math.sin(tilt_rad) * math.cos(-azimuth)
+                         + sin_elevation * math.cos(tilt_rad))
+        
+        fluxes[i] = direct * max(cos_incidence, 0.0) + diffuse
+    return fluxes
+
+if njit is not None:
+    _solar_flux_njit = njit(cache=True, fastmath=True)(_solar_flux_loop)
+else:
+    _solar_flux_njit = None
+
+@functools.lru_cache(maxsize=128)
+def _solar_flux_profile_on_grid(latitude, day_of_year, n_samples, net_eff):
+    time = get_time_grid(n_samples)
+    if _solar_flux_njit is not None:
+        fluxes = _solar_flux_njit(math.radians(latitude), float(day_of_year), time, 0.0)
+    else:
+        fluxes = power_solar.solar_flux(
+            latitude=latitude,
+            day_of_year=day_of_year,
+            time=time,
+            panel_tilt_angle=0
+        )
+    profile = fluxes * net_eff
+    profile.setflags(write=False) # Shared between callers through the cache
+    return profile
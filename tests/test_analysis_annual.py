@@ -0,0 +1,32 @@
+import unittest
+import numpy as onp
+import analysis_annual
+
+class TestBatteryIntegrators(unittest.TestCase):
+    def test_closed_form_matches_loop(self):
+        """The NumPy closed form and the scalar loop must agree, including the charge cap."""
+        # Three days of a day/night cycle: strong sun tops the battery out before dusk,
+        # then the night drains it. Rows differ in strength so the cap bites differently.
+        time = onp.linspace(0, 86400, 50)
+        daylight = onp.clip(onp.cos(2 * onp.pi * time / 86400), 0, None)
+        power_in_by_day = onp.vstack([peak * daylight for peak in (900.0, 1500.0, 3000.0)])
+        total_power_out, dt = 400.0, 86400 / 49
+        max_energy_J, current_energy = 1.0e7, 6e6
+        
+        # The uncapped trajectory must overshoot, or the cap branch goes untested
+        uncapped = current_energy + onp.cumsum(power_in_by_day - total_power_out, axis=-1) * dt
+        self.assertTrue((uncapped.max(axis=-1) > max_energy_J).all())
+        
+        closed_form = analysis_annual._integrate_battery_numpy(
+            power_in_by_day, total_power_out, dt, max_energy_J, current_energy
+        )
+        loop = [
+            analysis_annual._integrate_battery_loop(
+                power_in, total_power_out, dt, max_energy_J, current_energy
+            )
+            for power_in in power_in_by_day
+        ]
+        onp.testing.assert_allclose(closed_form, loop, rtol=1e-12)
+        
+        # Minima fall during the night after the cap, below the starting charge
+        self.assertTrue((closed_form < current_energy).all())
@@ -0,0 +1,35 @@
+import unittest
+import analysis_annual
+from optimize import optimize_drone, DAY_OF_YEAR
+
+class TestOptimizeDrone(unittest.TestCase):
+    def test_default_mission(self):
+        """The default mission (5 kg payload, 20N, 350 Wh/kg) must solve."""
+        result = optimize_drone()
+        self.assertIsNotNone(result)
+        self.assertAlmostEqual(result['total_weight'], 39.83, places=1)
+        
+        # Perpetual: the battery ends the day where it started, within its capacity
+        self.assertAlmostEqual(result['energy'][0], result['energy'][-1], delta=1.0)
+        self.assertTrue(result['energy'].max() <= result['max_energy'] + 1.0)
+        self.assertGreaterEqual(result['energy'].min(), 0.0)
+
+    def test_default_design_survives_design_day(self):
+        """The annual analysis must agree that the optimized design flies its design day."""
+        result = optimize_drone()
+        design = {
+            "wingspan": result['wingspan'],
+            "aspect_ratio": result['aspect_ratio'],
+            "total_weight": result['total_weight'],
+            "battery_mass": result['battery_mass'],
+            "velocity": result['velocity'],
+            "energy_density": 350.0,
+        }
+        power_in = analysis_annual.solar_power_by_day([DAY_OF_YEAR], design, latitude=20.0)
+        margin = analysis_annual.check_feasibility_by_day(power_in, design)[0]
+        self.assertGreaterEqual(margin, 0.0)
+
+    def test_infeasible_mission(self):
+        """Missions past the physics limit report None instead of raising."""
+        result = optimize_drone(payload_mass=30, target_lat=60, min_battery_density=100)
+        self.assertIsNone(result)
@@ -1,8 +1,10 @@
+import math
 import unittest
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from physics_model import DronePhysics, PhysicsConstants
+from unittest import mock
+import numpy as onp
+from aerosandbox.library import power_solar
+import physics_model
+from physics_model import DronePhysics, PhysicsConstants, get_time_grid
 
 class TestPhysicsCore(unittest.TestCase):
     def test_geometry(self):
@@ -23,12 +25,22 @@ class TestPhysicsCore(unittest.TestCase):
         )
         
         # Manually sum components
-        manual_sum = (mass_data['structure'] + mass_data['propulsion'] + 
-                      mass_data['solar'] + mass_data['mppt'] + 
-                      mass_data['avionics'] + mass_data['battery'] + 
-                      mass_data['payload'])
+        manual_sum = (mass_data.structure + mass_data.propulsion + 
+                      mass_data.solar + mass_data.mppt + 
+                      mass_data.avionics + mass_data.battery + 
+                      mass_data.payload)
                       
-        self.assertAlmostEqual(mass_data['total_calculated'], manual_sum, places=3)
+        self.assertAlmostEqual(mass_data.total_calculated, manual_sum, places=3)
+        
+        # The optimizers' shortcut must agree with the full breakdown
+        total_only = DronePhysics.mass_total_only(
+            wingspan=35, 
+            wing_area=49, 
+            total_weight=150, 
+            battery_mass=50, 
+            payload_mass=5
+        )
+        self.assertAlmostEqual(total_only, mass_data.total_calculated, places=9)
         
     def test_aerodynamics(self):
         """Test aerodynamic sanity (Lift should approximate Weight)."""
@@ -43,5 +55,35 @@ class TestPhysicsCore(unittest.TestCase):
         self.assertTrue(aero['CD'] > PhysicsConstants.CD0)
         self.assertTrue(aero['power_required'] > 0)
 
-if __name__ == '__main__':
-    unittest.main()
+class TestSolarFlux(unittest.TestCase):
+    LATITUDES = (-89.5, -60, -23.4, 0, 20, 45, 66.6, 89.9)
+    DAYS = (1, 80, 172, 266, 355)
+
+    @unittest.skipIf(physics_model._solar_flux_njit is None, "numba is not installed")
+    def test_njit_port_matches_power_solar(self):
+        """The Numba port must track aerosandbox's solar_flux (flat and tilted panels)."""
+        time = get_time_grid(50)
+        for latitude in self.LATITUDES:
+            for day in self.DAYS:
+                for tilt in (0, 30):
+                    expected = power_solar.solar_flux(
+                        latitude=latitude, day_of_year=day, time=time, panel_tilt_angle=tilt
+                    )
+                    actual = physics_model._solar_flux_njit(
+                        math.radians(latitude), float(day), time, math.radians(tilt)
+                    )
+                    onp.testing.assert_allclose(actual, expected, rtol=0, atol=1e-6)
+
+    def test_profile_on_grid_fallback(self):
+        """Without numba, the cached profile comes from power_solar and is read-only."""
+        net_eff = DronePhysics.solar_net_efficiency()
+        with mock.patch.object(physics_model, "_solar_flux_njit", None):
+            for latitude in self.LATITUDES:
+                for day in self.DAYS:
+                    # __wrapped__ skips the lru_cache, so the fallback branch really runs
+                    profile = physics_model._solar_flux_profile_on_grid.__wrapped__(
+                        latitude, day, 50, net_eff
+                    )
+                    expected = DronePhysics.solar_flux_profile_per_m2(latitude, day, get_time_grid(50))
+                    onp.testing.assert_allclose(profile, expected, rtol=0, atol=1e-9)
+                    self.assertFalse(profile.flags.writeable)